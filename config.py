@@ -16,6 +16,25 @@ BUILDER_BASE_URL = "https://builder.aws.com"
 MAKECOM_WEBHOOK_URL = os.getenv("MAKECOM_WEBHOOK_URL", "")
 MAKECOM_API_KEY = os.getenv("MAKECOM_API_KEY", "")
 
+# Hashtags: how many to include and which tags win (first | popular | rare)
+HASHTAG_LIMIT = int(os.getenv("HASHTAG_LIMIT", "3"))
+HASHTAG_POLICY = os.getenv("HASHTAG_POLICY", "first")
+
+# Queue priority: score = sum(weight * signal), see src/priority.py.
+# Feeds can override weights with "priority_weights" in config/feeds.json.
+PRIORITY_WEIGHTS = {
+    "recency": 1.0,   # 1.0 when just published, halves every PRIORITY_HALF_LIFE_HOURS
+    "author": 0.2,    # author's posting history (0..1)
+    "tags": 0.3,      # popularity of the article's most popular tag (0..1)
+    "spam": -1.0,     # share of the author's articles flagged as spam (0..1)
+}
+PRIORITY_HALF_LIFE_HOURS = float(os.getenv("PRIORITY_HALF_LIFE_HOURS", "24"))
+
 # Output files
 MOCK_TWEETS_FILE = DATA_DIR / "mock_tweets.txt"
 TWEETS_QUEUE_FILE = DATA_DIR / "tweets_queue.json"
+
+# Retention: cold-storage archive and text/JSON output rotation
+ARCHIVE_DIR = DATA_DIR / "archive"
+MOCK_TWEETS_MAX_BYTES = int(os.getenv("MOCK_TWEETS_MAX_BYTES", str(1024 * 1024)))
+TWEETS_QUEUE_RETENTION_DAYS = int(os.getenv("TWEETS_QUEUE_RETENTION_DAYS", "7"))
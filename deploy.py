@@ -2,10 +2,10 @@
 """Deploy BuilderFeed flows with scheduling."""
 
 from prefect import serve
-from src.flows import fetch_flow, tweet_flow
+from src.flows import fetch_flow, tweet_flow, retention_flow
 
 if __name__ == "__main__":
-    # Deploy both flows with schedules
+    # Deploy flows with schedules
     fetch_deployment = fetch_flow.to_deployment(
         name="fetch-articles-deployment",
         cron="30 * * * *",  # Every hour at minute 30
@@ -17,6 +17,12 @@ if __name__ == "__main__":
         cron="0 * * * *",  # Every hour
         tags=["builderfeed"]
     )
+
+    retention_deployment = retention_flow.to_deployment(
+        name="retention-deployment",
+        cron="15 3 * * *",  # Daily at 03:15
+        tags=["builderfeed"]
+    )
     
-    # Serve both deployments
-    serve(fetch_deployment, tweet_deployment)
+    # Serve all deployments
+    serve(fetch_deployment, tweet_deployment, retention_deployment)
@@ -3,15 +3,14 @@
 
 import argparse
 import sqlite3
-from pathlib import Path
 from datetime import datetime, timedelta
+from src.feeds import get_profile
 
-DB_PATH = Path(__file__).parent.parent / "data" / "builderfeed.db"
 
-
-def check_spam(days=7):
+def check_spam(days=7, feed=None):
     """Show spam articles from last N days."""
-    conn = sqlite3.connect(DB_PATH)
+    profile = get_profile(feed)
+    conn = sqlite3.connect(profile['db_path'])
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -29,7 +28,7 @@ def check_spam(days=7):
     
     spam_articles = cursor.fetchall()
     
-    print(f"\n=== SPAM DETECTED (Last {days} Day{'s' if days != 1 else ''}) ===\n")
+    print(f"\n=== SPAM DETECTED [{profile['name']}] (Last {days} Day{'s' if days != 1 else ''}) ===\n")
     
     if not spam_articles:
         print(f"✅ No spam detected in the last {days} day{'s' if days != 1 else ''}")
@@ -62,6 +61,7 @@ def check_spam(days=7):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Check spam articles detected in the last N days")
     parser.add_argument("--days", type=int, default=7, help="Number of days to check (default: 7)")
+    parser.add_argument("--feed", help="Feed profile name (default: default)")
     
     args = parser.parse_args()
     
@@ -69,4 +69,4 @@ if __name__ == "__main__":
         print("Error: --days must be at least 1")
         exit(1)
     
-    check_spam(args.days)
+    check_spam(args.days, args.feed)
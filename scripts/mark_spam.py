@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 """Script to retroactively mark spam in existing database articles."""
 
+import argparse
 import sqlite3
-from pathlib import Path
-from src.spam_filter import check_spam
+from src.spam_filter import check_spam, load_rules
+from src.database import rebuild_tag_index
+from src.feeds import get_profile
 
-DB_PATH = Path(__file__).parent.parent / "data" / "builderfeed.db"
-
-def mark_existing_spam():
-    """Check all existing articles and mark spam."""
-    conn = sqlite3.connect(DB_PATH)
+def mark_existing_spam(feed=None):
+    """Check all existing articles of a feed and mark spam."""
+    profile = get_profile(feed)
+    db_path = profile['db_path']
+    rules = load_rules(profile['spam_rules'])
+    
+    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -20,7 +24,7 @@ def mark_existing_spam():
     spam_count = 0
     for row in articles:
         article = dict(row)
-        is_spam, matched_rules = check_spam(article)
+        is_spam, matched_rules = check_spam(article, rules)
         
         if is_spam:
             cursor.execute("UPDATE articles SET is_spam = 1 WHERE id = ?", (article['id'],))
@@ -30,10 +34,14 @@ def mark_existing_spam():
     conn.commit()
     conn.close()
     
-    print(f"\n✅ Marked {spam_count} articles as spam")
+    # Spam articles don't count towards tag frequencies
+    if spam_count:
+        rebuild_tag_index(db_path)
+    
+    print(f"\n✅ Marked {spam_count} articles as spam [{profile['name']}]")
     
     # Show updated stats
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute("SELECT COUNT(*) FROM articles WHERE is_spam = 1")
     total_spam = cursor.fetchone()[0]
@@ -44,4 +52,9 @@ def mark_existing_spam():
     print(f"📊 Stats: {total_spam} spam articles, {pending} pending clean articles")
 
 if __name__ == "__main__":
-    mark_existing_spam()
+    parser = argparse.ArgumentParser(description="Retroactively mark spam in existing articles")
+    parser.add_argument("--feed", help="Feed profile name (default: default)")
+    
+    args = parser.parse_args()
+    
+    mark_existing_spam(args.feed)
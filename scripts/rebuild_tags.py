@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Backfill normalized tag tables from articles.tags and recount frequencies."""
+
+import argparse
+from src.database import init_db, rebuild_tag_index, get_top_tags
+from src.feeds import get_profile
+
+
+def rebuild_tags(feed=None):
+    """Create tag tables if needed and rebuild them from existing articles."""
+    profile = get_profile(feed)
+    init_db(profile['db_path'])
+    rebuild_tag_index(profile['db_path'])
+    
+    top = get_top_tags(weeks=1, limit=5, db_path=profile['db_path'])
+    print(f"✅ Tag index rebuilt [{profile['name']}]")
+    if top:
+        print(f"📊 Top tags this week: {', '.join(row['hashtag'] for row in top)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the normalized tag index")
+    parser.add_argument("--feed", help="Feed profile name (default: default)")
+    
+    args = parser.parse_args()
+    
+    rebuild_tags(args.feed)
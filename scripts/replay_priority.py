@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Replay the article archive to compare queue policies offline."""
+
+import argparse
+import json
+import sqlite3
+from datetime import datetime
+from statistics import mean, median
+
+from src.feeds import get_profile
+from src.priority import (SIGNALS, compute_signals, score, to_seconds, load_author_stats,
+                          load_tag_popularity)
+
+
+def load_history(db_path):
+    """Load non-spam articles, signals and actual tweet times from a feed database."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT a.id, a.author_alias, a.published_at, a.fetched_at, l.tweeted_at
+        FROM articles a
+        LEFT JOIN tweet_log l ON l.content_id = a.content_id
+        WHERE a.is_spam = 0
+        ORDER BY a.fetched_at ASC
+    """)
+    articles = [dict(row) for row in cursor.fetchall()]
+    
+    authors = load_author_stats(cursor, pending_only=False)
+    tag_popularity = load_tag_popularity(cursor, pending_only=False)
+    
+    conn.close()
+    return articles, authors, tag_popularity
+
+
+def simulate(articles, pick, interval_hours=1.0):
+    """Post one available article per interval using pick(available, now, posted_by_author).
+    
+    Returns list of (article, posted_at) in posting order.
+    """
+    if not articles:
+        return []
+    
+    step = interval_hours * 3600
+    now = articles[0]['fetched_at'] - articles[0]['fetched_at'] % step + step
+    end = datetime.now().timestamp()
+    
+    available = []
+    posted = []
+    posted_by_author = {}
+    next_arrival = 0
+    
+    while now <= end and (next_arrival < len(articles) or available):
+        while next_arrival < len(articles) and articles[next_arrival]['fetched_at'] <= now:
+            available.append(articles[next_arrival])
+            next_arrival += 1
+    
+        if available:
+            article = pick(available, now, posted_by_author)
+            available.remove(article)
+            posted.append((article, now))
+            alias = article['author_alias']
+            posted_by_author[alias] = posted_by_author.get(alias, 0) + 1
+    
+        now += step
+    
+    return posted
+
+
+def oldest_first(available, now, posted_by_author):
+    """Previous policy: oldest published first."""
+    return min(available, key=lambda a: to_seconds(a['published_at']) or a['fetched_at'])
+
+
+def make_priority_pick(authors, tag_popularity, weights, half_life_hours):
+    """Build a pick function for the priority policy."""
+    def pick(available, now, posted_by_author):
+        def priority(article):
+            author = authors.get(article['author_alias'], {"spam": 0, "total": 0})
+            signals = compute_signals(
+                article,
+                author_posts=posted_by_author.get(article['author_alias'], 0),
+                author_spam_ratio=author["spam"] / author["total"] if author["total"] else 0.0,
+                tag_popularity=tag_popularity.get(article['id'], 0.0),
+                half_life_hours=half_life_hours,
+                now=now
+            )
+            return score(signals, weights)
+        return max(available, key=priority)
+    return pick
+
+
+def summarize(name, posted, total):
+    """Print delay statistics for one policy."""
+    waits = [(t - a['fetched_at']) / 3600 for a, t in posted]
+    ages = [(t - (to_seconds(a['published_at']) or a['fetched_at'])) / 3600 for a, t in posted]
+    
+    print(f"\n{name}")
+    print(f"  Posted: {len(posted)} of {total}")
+    if not posted:
+        return
+    
+    fresh = sum(1 for age in ages if age <= 24)
+    print(f"  Queue wait (h):    mean {mean(waits):.1f}, median {median(waits):.1f}, "
+          f"p90 {sorted(waits)[int(len(waits) * 0.9)]:.1f}")
+    print(f"  Age when posted (h): mean {mean(ages):.1f}, median {median(ages):.1f}")
+    print(f"  Posted within 24h of publishing: {fresh / len(posted):.0%}")
+
+
+def replay(feed=None, weights=None, half_life_hours=None, interval_hours=1.0):
+    """Compare actual history, oldest-first and priority policies on the archive."""
+    profile = get_profile(feed)
+    weights = {**profile['priority_weights'], **(weights or {})}
+    half_life_hours = half_life_hours or profile['priority_half_life_hours']
+    
+    articles, authors, tag_popularity = load_history(profile['db_path'])
+    
+    print(f"\n=== PRIORITY REPLAY [{profile['name']}] ===")
+    print(f"Articles: {len(articles)}, interval: {interval_hours}h, half-life: {half_life_hours}h")
+    print(f"Weights: {json.dumps(weights)}")
+    
+    actual = [(a, a['tweeted_at']) for a in articles if a['tweeted_at']]
+    summarize("Actual history (tweet_log)", actual, len(articles))
+    summarize("Oldest first", simulate(articles, oldest_first, interval_hours), len(articles))
+    
+    pick = make_priority_pick(authors, tag_popularity, weights, half_life_hours)
+    summarize("Priority", simulate(articles, pick, interval_hours), len(articles))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the archive to compare queue policies")
+    parser.add_argument("--feed", help="Feed profile name (default: default)")
+    parser.add_argument("--weights", type=json.loads, default=None,
+                        help='Weight overrides as JSON, e.g. \'{"recency": 2.0, "tags": 0}\'')
+    parser.add_argument("--half-life", type=float, default=None, help="Recency half-life in hours")
+    parser.add_argument("--interval", type=float, default=1.0, help="Hours between posts (default: 1)")
+    
+    args = parser.parse_args()
+    
+    if args.interval <= 0:
+        print("Error: --interval must be positive")
+        exit(1)
+    
+    if args.half_life is not None and args.half_life <= 0:
+        print("Error: --half-life must be positive")
+        exit(1)
+    
+    unknown = set(args.weights or {}) - set(SIGNALS)
+    if unknown:
+        print(f"Error: unknown weights {', '.join(sorted(unknown))} (use: {', '.join(SIGNALS)})")
+        exit(1)
+    
+    replay(args.feed, args.weights, args.half_life, args.interval)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Archive aged rows, compact the database and rotate output files."""
+
+import argparse
+from src.feeds import get_profile
+from src.retention import run_retention
+
+
+def retention(dry_run=False, feed=None):
+    """Run retention policies and print a summary."""
+    profile = get_profile(feed)
+    result = run_retention(profile, dry_run=dry_run)
+    
+    print(f"\n=== RETENTION [{profile['name']}]{' (DRY RUN)' if dry_run else ''} ===\n")
+    
+    for policy_id, count in result['policies'].items():
+        print(f"  {policy_id}: {count} row{'s' if count != 1 else ''} {'to archive' if dry_run else 'archived'}")
+    
+    print(f"  tweets_queue: {result['queue_entries_archived']} entries {'to archive' if dry_run else 'archived'}")
+    print(f"  mock_tweets: {'rotated' if result['mock_tweets_rotated'] else 'below size limit'}")
+    
+    if not dry_run:
+        print(f"\n📦 Reclaimed {result['pages_reclaimed']} database pages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply retention policies")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    parser.add_argument("--feed", help="Feed profile name (default: default)")
+    
+    args = parser.parse_args()
+    
+    retention(args.dry_run, args.feed)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Show the most frequent tags per week over the last N weeks."""
+
+import argparse
+from src.database import get_top_tags
+from src.feeds import get_profile
+
+
+def top_tags(weeks=4, limit=10, feed=None):
+    """Print top non-spam tags grouped by week."""
+    profile = get_profile(feed)
+    rows = get_top_tags(weeks=weeks, limit=limit, db_path=profile['db_path'])
+    
+    print(f"\n=== TOP TAGS [{profile['name']}] (Last {weeks} Week{'s' if weeks != 1 else ''}) ===")
+    
+    if not rows:
+        print("\nNo tagged articles in this period")
+        return
+    
+    current_week = None
+    for row in rows:
+        if row['week'] != current_week:
+            current_week = row['week']
+            print(f"\n{current_week}")
+        print(f"  {row['count']:>4}  {row['hashtag']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the most frequent tags per week")
+    parser.add_argument("--weeks", type=int, default=4, help="Number of weeks to show (default: 4)")
+    parser.add_argument("--limit", type=int, default=10, help="Tags per week (default: 10)")
+    parser.add_argument("--feed", help="Feed profile name (default: default)")
+    
+    args = parser.parse_args()
+    
+    if args.weeks < 1 or args.limit < 1:
+        print("Error: --weeks and --limit must be at least 1")
+        exit(1)
+    
+    top_tags(args.weeks, args.limit, args.feed)
@@ -1,16 +1,32 @@
 import sqlite3
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 DB_PATH = Path(__file__).parent.parent / "data" / "builderfeed.db"
 
+# Hashtag selection policy -> ORDER BY for get_article_hashtags
+HASHTAG_POLICIES = {
+    "first": "at.position ASC",
+    "popular": "t.article_count DESC, at.position ASC",
+    "rare": "t.article_count ASC, at.position ASC",
+}
 
-def init_db():
+
+def _connect(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Open a feed database (defaults to the single-feed DB_PATH)."""
+    return sqlite3.connect(db_path or DB_PATH)
+
+
+def init_db(db_path: Optional[Path] = None):
     """Initialize database with schema."""
-    conn = sqlite3.connect(DB_PATH)
+    (db_path or DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
+    # Only takes effect on a new database; retention converts older ones
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS articles (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -24,10 +40,28 @@ def init_db():
             created_at INTEGER,
             published_at INTEGER,
             fetched_at INTEGER NOT NULL,
-            posted BOOLEAN DEFAULT 0
+            posted BOOLEAN DEFAULT 0,
+            is_spam BOOLEAN DEFAULT 0,
+            priority REAL
         )
     """)
     
+    # Older databases lack columns added after the first release
+    cursor.execute("PRAGMA table_info(articles)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if "is_spam" not in columns:
+        cursor.execute("ALTER TABLE articles ADD COLUMN is_spam BOOLEAN DEFAULT 0")
+    if "priority" not in columns:
+        cursor.execute("ALTER TABLE articles ADD COLUMN priority REAL")
+    
+    # Queue pop: index seek on pending articles by priority (see src/priority.py)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_articles_queue
+        ON articles(priority DESC, published_at ASC)
+        WHERE posted = 0 AND is_spam = 0
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_author ON articles(author_alias)")
+    
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS tweet_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -39,13 +73,66 @@ def init_db():
         )
     """)
     
+    # Normalized tags: one row per distinct tag with its hashtag form and
+    # a running count of non-spam articles carrying it
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            hashtag TEXT NOT NULL,
+            article_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_tags (
+            article_id INTEGER NOT NULL REFERENCES articles(id),
+            tag_id INTEGER NOT NULL REFERENCES tags(id),
+            position INTEGER NOT NULL,
+            PRIMARY KEY (article_id, tag_id)
+        ) WITHOUT ROWID
+    """)
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_tags_tag ON article_tags(tag_id)")
+    
     conn.commit()
     conn.close()
 
 
-def add_article(article: dict, is_spam: bool = False) -> bool:
+def tag_to_hashtag(tag: str) -> str:
+    """Convert a Builder tag (e.g. "amazon-bedrock") to a hashtag."""
+    return f"#{tag.strip().replace('-', '').replace(' ', '')}"
+
+
+def _index_tags(cursor: sqlite3.Cursor, article_id: int, tags: Optional[str], is_spam: bool):
+    """Link article to normalized tags, creating tags on first sight."""
+    if not tags:
+        return
+    
+    names = []
+    for name in (t.strip() for t in tags.split(',')):
+        if name and name not in names:
+            names.append(name)
+    
+    for position, name in enumerate(names):
+        cursor.execute(
+            "INSERT OR IGNORE INTO tags (name, hashtag) VALUES (?, ?)",
+            (name, tag_to_hashtag(name))
+        )
+        cursor.execute("SELECT id FROM tags WHERE name = ?", (name,))
+        tag_id = cursor.fetchone()[0]
+        
+        cursor.execute(
+            "INSERT OR IGNORE INTO article_tags (article_id, tag_id, position) VALUES (?, ?, ?)",
+            (article_id, tag_id, position)
+        )
+        if not is_spam and cursor.rowcount:
+            cursor.execute("UPDATE tags SET article_count = article_count + 1 WHERE id = ?", (tag_id,))
+
+
+def add_article(article: dict, is_spam: bool = False, db_path: Optional[Path] = None) -> bool:
     """Add article to queue if not already posted. Returns True if added."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     # Check if already posted
@@ -79,21 +166,26 @@ def add_article(article: dict, is_spam: bool = False) -> bool:
         1 if is_spam else 0
     ))
     
+    _index_tags(cursor, cursor.lastrowid, article.get('tags'), is_spam)
+    
     conn.commit()
     conn.close()
     return True
 
 
-def get_next_article() -> Optional[dict]:
-    """Get next unposted, non-spam article - oldest published first."""
-    conn = sqlite3.connect(DB_PATH)
+def get_next_article(db_path: Optional[Path] = None) -> Optional[dict]:
+    """Get next unposted, non-spam article - highest priority first.
+    
+    Articles not scored yet (priority NULL) come last, oldest published first.
+    """
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
     cursor.execute("""
         SELECT * FROM articles 
         WHERE posted = 0 AND is_spam = 0
-        ORDER BY published_at ASC 
+        ORDER BY priority DESC, published_at ASC
         LIMIT 1
     """)
     
@@ -105,9 +197,9 @@ def get_next_article() -> Optional[dict]:
     return None
 
 
-def mark_posted(content_id: str, tweet_id: Optional[str] = None):
+def mark_posted(content_id: str, tweet_id: Optional[str] = None, db_path: Optional[Path] = None):
     """Mark article as posted and log to tweet_log."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     # Get article details
@@ -131,9 +223,9 @@ def mark_posted(content_id: str, tweet_id: Optional[str] = None):
     conn.close()
 
 
-def get_stats() -> dict:
+def get_stats(db_path: Optional[Path] = None) -> dict:
     """Get queue statistics."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     cursor.execute("SELECT COUNT(*) FROM articles WHERE posted = 0 AND is_spam = 0")
@@ -148,3 +240,104 @@ def get_stats() -> dict:
     conn.close()
     
     return {"pending": pending, "posted": posted, "spam": spam}
+
+
+def get_article_hashtags(article_id: int, limit: int = 3, policy: str = "first",
+                         db_path: Optional[Path] = None) -> List[str]:
+    """Get hashtags for an article, best first according to policy.
+    
+    Policies:
+        first:   tag order as published by the author
+        popular: most frequent tags across the archive first
+        rare:    least frequent (most specific) tags first
+    """
+    order_by = HASHTAG_POLICIES.get(policy)
+    if order_by is None:
+        raise ValueError(f"Unknown hashtag policy: {policy}")
+    
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute(f"""
+        SELECT t.hashtag FROM article_tags at
+        JOIN tags t ON t.id = at.tag_id
+        WHERE at.article_id = ?
+        ORDER BY {order_by}
+        LIMIT ?
+    """, (article_id, limit))
+    
+    hashtags = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    
+    return hashtags
+
+
+def get_top_tags(weeks: int = 4, limit: int = 10, db_path: Optional[Path] = None) -> List[dict]:
+    """Get most frequent non-spam tags per ISO week (YYYY-Www) over the last N weeks.
+    
+    Articles are bucketed by publish time, not fetch time, so a backlog
+    fetched at once still lands in the weeks it was published.
+    """
+    conn = _connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    cutoff_ts = int(datetime.now().timestamp()) - weeks * 7 * 24 * 3600
+    
+    # published_at may be in milliseconds (see priority.to_seconds). The
+    # Thursday of a date's week gives its ISO year and week number.
+    cursor.execute("""
+        WITH dated AS (
+            SELECT id, COALESCE(
+                       CASE WHEN published_at > 10000000000 THEN published_at / 1000
+                            ELSE published_at END,
+                       fetched_at) AS ts
+            FROM articles
+            WHERE is_spam = 0
+        ),
+        weekly AS (
+            SELECT id, date(ts, 'unixepoch', '-3 days', 'weekday 4') AS thursday
+            FROM dated
+            WHERE ts >= ?
+        )
+        SELECT week, name, hashtag, count FROM (
+            SELECT printf('%s-W%02d', strftime('%Y', w.thursday),
+                          (strftime('%j', w.thursday) - 1) / 7 + 1) AS week,
+                   t.name, t.hashtag, COUNT(*) AS count,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY w.thursday
+                       ORDER BY COUNT(*) DESC, t.name ASC
+                   ) AS rank
+            FROM weekly w
+            JOIN article_tags at ON at.article_id = w.id
+            JOIN tags t ON t.id = at.tag_id
+            GROUP BY w.thursday, t.id
+        )
+        WHERE rank <= ?
+        ORDER BY week DESC, count DESC, name ASC
+    """, (cutoff_ts, limit))
+    
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    
+    return rows
+
+
+def rebuild_tag_index(db_path: Optional[Path] = None):
+    """Rebuild tags/article_tags from articles.tags and recount frequencies.
+    
+    Used to backfill databases created before tag normalization and to
+    resync counts after articles are retroactively marked as spam.
+    """
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute("DELETE FROM article_tags")
+    cursor.execute("UPDATE tags SET article_count = 0")
+    
+    cursor.execute("SELECT id, tags, is_spam FROM articles WHERE tags IS NOT NULL")
+    for article_id, tags, is_spam in cursor.fetchall():
+        _index_tags(cursor, article_id, tags, bool(is_spam))
+    
+    conn.commit()
+    conn.close()
@@ -0,0 +1,114 @@
+"""Feed profiles: run several Builder feeds/bots from one process."""
+
+import json
+import os
+import re
+from typing import Dict, List, Any, Optional
+
+from config import (BASE_DIR, DATA_DIR, ARCHIVE_DIR, MOCK_TWEETS_FILE, TWEETS_QUEUE_FILE,
+                    MAKECOM_WEBHOOK_URL, MAKECOM_API_KEY, HASHTAG_LIMIT, HASHTAG_POLICY,
+                    PRIORITY_WEIGHTS, PRIORITY_HALF_LIFE_HOURS)
+from src.database import DB_PATH, HASHTAG_POLICIES
+from src.priority import SIGNALS
+
+
+FEEDS_FILE = BASE_DIR / "config" / "feeds.json"
+
+DEFAULT_FEED = "default"
+
+
+def build_profile(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve a feed entry from config into a full profile.
+    
+    The default feed keeps the single-feed paths and .env settings. Other
+    feeds get their own database, queue and archive under data/<name>/.
+    """
+    name = data.get("name", DEFAULT_FEED)
+    if not re.fullmatch(r"[a-z0-9_-]+", name):
+        raise ValueError(f"Invalid feed name: {name} (use lowercase letters, digits, - and _)")
+    
+    if name == DEFAULT_FEED:
+        profile = {
+            "db_path": DB_PATH,
+            "queue_file": TWEETS_QUEUE_FILE,
+            "mock_file": MOCK_TWEETS_FILE,
+            "archive_dir": ARCHIVE_DIR,
+            "webhook_url": MAKECOM_WEBHOOK_URL,
+            "api_key": MAKECOM_API_KEY,
+        }
+    else:
+        feed_dir = DATA_DIR / name
+        profile = {
+            "db_path": feed_dir / "builderfeed.db",
+            "queue_file": feed_dir / "tweets_queue.json",
+            "mock_file": feed_dir / "mock_tweets.txt",
+            "archive_dir": feed_dir / "archive",
+            # Secrets stay in .env; the profile only names the variables
+            "webhook_url": os.getenv(data.get("webhook_url_env", ""), ""),
+            "api_key": os.getenv(data.get("api_key_env", ""), ""),
+        }
+    
+    profile.update({
+        "name": name,
+        "content_type": data.get("content_type", "ARTICLE"),
+        "tags": data.get("tags", []),
+        "spam_rules": [BASE_DIR / "config" / f for f in data.get("spam_rules", [])],
+        "hashtag_limit": data.get("hashtag_limit", HASHTAG_LIMIT),
+        "hashtag_policy": data.get("hashtag_policy", HASHTAG_POLICY),
+        "priority_weights": {**PRIORITY_WEIGHTS, **data.get("priority_weights", {})},
+        "priority_half_life_hours": data.get("priority_half_life_hours", PRIORITY_HALF_LIFE_HOURS),
+    })
+    
+    # Fail when config is loaded, not hours later when a tweet is formatted
+    if profile["hashtag_policy"] not in HASHTAG_POLICIES:
+        raise ValueError(f"Feed {name}: unknown hashtag policy {profile['hashtag_policy']} "
+                         f"(use one of: {', '.join(HASHTAG_POLICIES)})")
+    if not isinstance(profile["hashtag_limit"], int) or profile["hashtag_limit"] < 0:
+        raise ValueError(f"Feed {name}: hashtag_limit must be a non-negative integer")
+    
+    half_life = profile["priority_half_life_hours"]
+    if isinstance(half_life, bool) or not isinstance(half_life, (int, float)) or half_life <= 0:
+        raise ValueError(f"Feed {name}: priority_half_life_hours must be a positive number")
+    for signal, weight in profile["priority_weights"].items():
+        if signal not in SIGNALS:
+            raise ValueError(f"Feed {name}: unknown priority weight {signal} "
+                             f"(use one of: {', '.join(SIGNALS)})")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+            raise ValueError(f"Feed {name}: priority weight {signal} must be a number")
+    
+    return profile
+
+
+def load_profiles() -> List[Dict[str, Any]]:
+    """Load enabled feed profiles from config/feeds.json.
+    
+    Without a feeds file the bot runs the single default feed.
+    """
+    feeds = [{"name": DEFAULT_FEED}]
+    
+    if FEEDS_FILE.exists():
+        with open(FEEDS_FILE) as f:
+            data = json.load(f)
+            feeds = data.get("feeds", [])
+    
+    profiles = [build_profile(f) for f in feeds if f.get("enabled", True)]
+    
+    names = [p["name"] for p in profiles]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate feed names in {FEEDS_FILE}")
+    
+    return profiles
+
+
+def get_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """Get a feed profile by name (default feed if None)."""
+    name = name or DEFAULT_FEED
+    
+    for profile in load_profiles():
+        if profile["name"] == name:
+            return profile
+    
+    if name == DEFAULT_FEED:
+        return build_profile({"name": DEFAULT_FEED})
+    
+    raise ValueError(f"Unknown feed: {name}")
@@ -1,18 +1,36 @@
 import httpx
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
+import threading
 from config import BUILDER_API_URL, BUILDER_BASE_URL
-from src.database import add_article
-from src.spam_filter import check_spam
+from src.database import init_db, add_article
+from src.feeds import get_profile
+from src.priority import rescore_pending
+from src.spam_filter import check_spam, load_rules
 
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
 
-def fetch_feed() -> List[Dict]:
+
+def get_client() -> httpx.Client:
+    """Shared HTTP client so all feeds reuse one connection pool."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                timeout=30,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+            )
+        return _client
+
+
+def fetch_feed(content_type: str = "ARTICLE") -> List[Dict]:
     """Fetch articles from AWS Builder feed API."""
     payload = {
-        "contentType": "ARTICLE",
-        "sort": {"article": {"sortOrder": "NEWEST"}}
+        "contentType": content_type,
+        "sort": {content_type.lower(): {"sortOrder": "NEWEST"}}
     }
     
     headers = {
@@ -25,27 +43,29 @@ def fetch_feed() -> List[Dict]:
     }
     
     try:
-        response = httpx.post(BUILDER_API_URL, json=payload, headers=headers, timeout=30)
+        response = get_client().post(BUILDER_API_URL, json=payload, headers=headers)
         response.raise_for_status()
         data = response.json()
         return data.get("feedContents", [])
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
-            # Fallback to cached feed
-            print("⚠️  API requires authentication, using cached feed")
-            feed_path = Path(__file__).parent.parent / "tmp" / "feed.json"
+            # Fallback to cached feed, one file per content type
+            # (tmp/feed.json holds the original ARTICLE cache)
+            print(f"⚠️  API requires authentication, using cached {content_type} feed")
+            cache_name = "feed.json" if content_type == "ARTICLE" else f"feed.{content_type.lower()}.json"
+            feed_path = Path(__file__).parent.parent / "tmp" / cache_name
             if feed_path.exists():
                 with open(feed_path) as f:
                     data = json.load(f)
                     return data.get("feedContents", [])
-            raise Exception("No cached feed available and API requires authentication")
+            raise Exception(f"No cached {content_type} feed available and API requires authentication")
         raise
 
 
-def parse_article(raw: dict) -> dict:
+def parse_article(raw: dict, content_type: str = "ARTICLE") -> dict:
     """Parse raw API article into database format."""
     author = raw.get("author", {})
-    article_data = raw.get("contentTypeSpecificResponse", {}).get("article", {})
+    article_data = raw.get("contentTypeSpecificResponse", {}).get(content_type.lower(), {})
     tags = article_data.get("tags", [])
     
     return {
@@ -61,21 +81,47 @@ def parse_article(raw: dict) -> dict:
     }
 
 
-def process_articles() -> dict:
-    """Fetch and add new articles to database. Returns stats."""
-    articles = fetch_feed()
+def matches_tags(article: dict, tags: List[str]) -> bool:
+    """Check if article carries any of the feed's tags (no filter if empty)."""
+    if not tags:
+        return True
+    
+    article_tags = {t.strip().lower() for t in (article.get('tags') or '').split(',')}
+    return any(tag.lower() in article_tags for tag in tags)
+
+
+def process_articles(profile: Optional[dict] = None, articles: Optional[List[Dict]] = None) -> dict:
+    """Fetch and add new articles to a feed's database. Returns stats.
+    
+    Args:
+        profile: Feed profile (default feed if None)
+        articles: Raw feed already fetched for this content type, so feeds
+            sharing a content type share one API call
+    """
+    profile = profile or get_profile()
+    if articles is None:
+        articles = fetch_feed(profile['content_type'])
+    
+    # New feeds get their database on first fetch
+    init_db(profile['db_path'])
+    rules = load_rules(profile['spam_rules'])
     
     added = 0
     skipped = 0
+    filtered = 0
     spam_detected = 0
     
     for raw in articles:
-        article = parse_article(raw)
+        article = parse_article(raw, profile['content_type'])
+        
+        if not matches_tags(article, profile['tags']):
+            filtered += 1
+            continue
         
         # Check for spam
-        is_spam, matched_rules = check_spam(article)
+        is_spam, matched_rules = check_spam(article, rules)
         
-        if add_article(article, is_spam=is_spam):
+        if add_article(article, is_spam=is_spam, db_path=profile['db_path']):
             if is_spam:
                 spam_detected += 1
                 print(f"🚫 SPAM detected: {article['title'][:60]}... (rules: {', '.join(matched_rules)})")
@@ -84,9 +130,13 @@ def process_articles() -> dict:
         else:
             skipped += 1
     
+    # Score new articles and decay the rest of the queue
+    rescore_pending(profile)
+    
     return {
         "fetched": len(articles),
         "added": added,
         "skipped": skipped,
+        "filtered": filtered,
         "spam_detected": spam_detected
     }
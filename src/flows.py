@@ -1,67 +1,135 @@
 from prefect import flow, task, get_run_logger
-from src.fetcher import process_articles
+from src.feeds import load_profiles
+from src.fetcher import fetch_feed, process_articles
 from src.twitter import post_tweet
-from src.database import get_stats
+from src.database import init_db, get_stats
+from src.retention import run_retention
+
+
+def completed_results(keys: list, futures, logger, action: str) -> dict:
+    """Wait for mapped task runs and return results by key, skipping failures.
+    
+    One feed failing (e.g. a 401 with no cached response) must not stop
+    the others, so failures are logged instead of raised.
+    """
+    results = {}
+    for key, future in zip(keys, futures):
+        future.wait()
+        if future.state.is_completed():
+            results[key] = future.result()
+        else:
+            logger.error(f"[{key}] {action} failed, skipping: {future.state.message}")
+    return results
 
 
 @task(retries=2, retry_delay_seconds=60)
-def fetch_articles_task():
-    """Fetch new articles from AWS Builder."""
+def fetch_feed_task(content_type: str):
+    """Fetch one content type from AWS Builder (shared by all feeds using it)."""
+    logger = get_run_logger()
+    
+    logger.info(f"Fetching {content_type} feed from AWS Builder...")
+    return fetch_feed(content_type)
+
+
+@task
+def fetch_articles_task(profile: dict, articles: list):
+    """Add new articles from a fetched feed to one profile's queue."""
     logger = get_run_logger()
     
-    logger.info("Fetching articles from AWS Builder...")
-    result = process_articles()
+    result = process_articles(profile, articles)
     
-    logger.info(f"Fetched: {result['fetched']}, Added: {result['added']}, Skipped: {result['skipped']}")
+    logger.info(f"[{profile['name']}] Fetched: {result['fetched']}, Added: {result['added']}, "
+                f"Skipped: {result['skipped']}, Filtered: {result['filtered']}")
+    
+    stats = get_stats(profile['db_path'])
+    logger.info(f"[{profile['name']}] Queue stats - Pending: {stats['pending']}, Posted: {stats['posted']}")
     return result
 
 
 @task(retries=1)
-def post_tweet_task():
-    """Post one article from queue."""
+def post_tweet_task(profile: dict):
+    """Post one article from a profile's queue."""
     logger = get_run_logger()
     
-    result = post_tweet()
+    # A feed that has never been fetched has no database yet
+    init_db(profile['db_path'])
+    
+    stats_before = get_stats(profile['db_path'])
+    logger.info(f"[{profile['name']}] Queue before - Pending: {stats_before['pending']}, Posted: {stats_before['posted']}")
+    
+    result = post_tweet(profile)
     
     if result:
-        logger.info(f"Posted tweet: {result['title'][:50]}...")
-        logger.info(f"Tweet ID: {result['tweet_id']}")
-        return result
+        logger.info(f"[{profile['name']}] Posted tweet: {result['title'][:50]}...")
+        logger.info(f"[{profile['name']}] Tweet ID: {result['tweet_id']}")
     else:
-        logger.warning("Queue is empty, no tweet posted")
-        return None
+        logger.warning(f"[{profile['name']}] Queue is empty, no tweet posted")
+    
+    stats_after = get_stats(profile['db_path'])
+    logger.info(f"[{profile['name']}] Queue after - Pending: {stats_after['pending']}, Posted: {stats_after['posted']}")
+    return result
+
+
+@task
+def retention_task(profile: dict):
+    """Archive aged rows, compact the database and rotate output files."""
+    logger = get_run_logger()
+    
+    init_db(profile['db_path'])
+    
+    result = run_retention(profile)
+    
+    for policy_id, count in result['policies'].items():
+        logger.info(f"[{profile['name']}] Retention {policy_id}: {count} rows archived")
+    logger.info(f"[{profile['name']}] Queue entries archived: {result['queue_entries_archived']}, "
+                f"Mock log rotated: {result['mock_tweets_rotated']}, "
+                f"Pages reclaimed: {result['pages_reclaimed']}")
+    return result
 
 
 @flow(name="builderfeed: fetch-articles", log_prints=True)
 def fetch_flow():
-    """Flow to fetch new articles periodically."""
+    """Flow to fetch new articles for all feeds periodically."""
     logger = get_run_logger()
     
-    logger.info("Starting fetch flow...")
-    result = fetch_articles_task()
+    profiles = load_profiles()
+    logger.info(f"Starting fetch flow for {len(profiles)} feed(s)...")
     
-    stats = get_stats()
-    logger.info(f"Queue stats - Pending: {stats['pending']}, Posted: {stats['posted']}")
+    # One API call per content type, run in parallel; feeds sharing a
+    # content type reuse the same response
+    content_types = sorted({p['content_type'] for p in profiles})
+    feeds = completed_results(content_types, fetch_feed_task.map(content_types), logger, "Fetch")
     
-    return result
+    ready = [p for p in profiles if p['content_type'] in feeds]
+    futures = fetch_articles_task.map(ready, [feeds[p['content_type']] for p in ready])
+    
+    return completed_results([p['name'] for p in ready], futures, logger, "Ingest")
 
 
 @flow(name="builderfeed: post-tweets", log_prints=True)
 def tweet_flow():
-    """Flow to post one tweet per hour."""
+    """Flow to post one tweet per feed per hour."""
     logger = get_run_logger()
     
-    logger.info("Starting tweet flow...")
+    profiles = load_profiles()
+    logger.info(f"Starting tweet flow for {len(profiles)} feed(s)...")
+    
+    futures = post_tweet_task.map(profiles)
     
-    stats_before = get_stats()
-    logger.info(f"Queue before - Pending: {stats_before['pending']}, Posted: {stats_before['posted']}")
+    return completed_results([p['name'] for p in profiles], futures, logger, "Post")
+
+
+@flow(name="builderfeed: retention", log_prints=True)
+def retention_flow():
+    """Flow to apply retention policies to all feeds daily."""
+    logger = get_run_logger()
     
-    result = post_tweet_task()
+    profiles = load_profiles()
+    logger.info(f"Starting retention flow for {len(profiles)} feed(s)...")
     
-    stats_after = get_stats()
-    logger.info(f"Queue after - Pending: {stats_after['pending']}, Posted: {stats_after['posted']}")
+    results = retention_task.map(profiles).result()
     
-    return result
+    return {p['name']: r for p, r in zip(profiles, results)}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""Priority scoring for the tweet queue."""
+
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+
+SIGNALS = ["recency", "author", "tags", "spam"]
+
+
+def to_seconds(ts: Optional[int]) -> Optional[float]:
+    """Normalize an epoch timestamp to seconds (Builder API may send milliseconds)."""
+    if ts is None:
+        return None
+    return ts / 1000 if ts > 10_000_000_000 else float(ts)
+
+
+def compute_signals(article: Dict[str, Any], author_posts: int, author_spam_ratio: float,
+                    tag_popularity: float, half_life_hours: float, now: float) -> Dict[str, float]:
+    """Compute the 0..1 signals the priority score blends.
+    
+    Args:
+        article: Article with published_at / fetched_at
+        author_posts: Articles by the same author already tweeted
+        author_spam_ratio: Share of the author's articles flagged as spam
+        tag_popularity: Article's most popular tag count / most popular tag count overall
+        half_life_hours: Hours for the recency signal to halve
+        now: Epoch seconds to score at
+    """
+    published = to_seconds(article.get("published_at")) or to_seconds(article.get("fetched_at")) or now
+    age_hours = max(0.0, (now - published) / 3600)
+    
+    return {
+        "recency": 0.5 ** (age_hours / half_life_hours),
+        "author": author_posts / (author_posts + 3),
+        "tags": tag_popularity,
+        "spam": author_spam_ratio,
+    }
+
+
+def score(signals: Dict[str, float], weights: Dict[str, float]) -> float:
+    """Blend signals into a priority score (higher is posted first)."""
+    return sum(weights.get(name, 0.0) * signals[name] for name in SIGNALS)
+
+
+def load_author_stats(cursor: sqlite3.Cursor, pending_only: bool = True) -> Dict[str, Dict[str, int]]:
+    """Get posted / spam / total article counts per author.
+    
+    Posted counts come from tweet_log. With pending_only, only authors that
+    have articles waiting in the queue are looked up.
+    """
+    pending_authors = "SELECT author_alias FROM articles WHERE posted = 0 AND is_spam = 0"
+    author_filter = f"AND author_alias IN ({pending_authors})" if pending_only else ""
+    posted_author_filter = f"AND a.author_alias IN ({pending_authors})" if pending_only else ""
+    
+    cursor.execute(f"""
+        SELECT author_alias, SUM(is_spam), COUNT(*) FROM articles
+        WHERE author_alias IS NOT NULL {author_filter}
+        GROUP BY author_alias
+    """)
+    stats = {alias: {"posted": 0, "spam": spam or 0, "total": total}
+             for alias, spam, total in cursor.fetchall()}
+    
+    cursor.execute(f"""
+        SELECT a.author_alias, COUNT(*) FROM tweet_log l
+        JOIN articles a ON a.content_id = l.content_id
+        WHERE a.author_alias IS NOT NULL {posted_author_filter}
+        GROUP BY a.author_alias
+    """)
+    for alias, posted in cursor.fetchall():
+        stats.setdefault(alias, {"posted": 0, "spam": 0, "total": 0})["posted"] = posted
+    
+    return stats
+
+
+def load_tag_popularity(cursor: sqlite3.Cursor, pending_only: bool = True) -> Dict[int, float]:
+    """Get each article's most popular tag count, normalized to 0..1."""
+    cursor.execute("SELECT MAX(article_count) FROM tags")
+    max_count = cursor.fetchone()[0] or 0
+    if not max_count:
+        return {}
+    
+    posted_filter = "AND a.posted = 0" if pending_only else ""
+    
+    cursor.execute(f"""
+        SELECT at.article_id, MAX(t.article_count) FROM article_tags at
+        JOIN tags t ON t.id = at.tag_id
+        JOIN articles a ON a.id = at.article_id
+        WHERE a.is_spam = 0 {posted_filter}
+        GROUP BY at.article_id
+    """)
+    return {article_id: count / max_count for article_id, count in cursor.fetchall()}
+
+
+def rescore_pending(profile: dict, now: Optional[float] = None) -> int:
+    """Recompute and store priority for all pending articles of a feed.
+    
+    Runs after each fetch, so new articles are scored at ingest, and before
+    each post, so the recency signal decays even while the API is down.
+    Returns articles scored.
+    """
+    weights = profile['priority_weights']
+    half_life = profile['priority_half_life_hours']
+    now = now or datetime.now().timestamp()
+    
+    conn = sqlite3.connect(profile['db_path'])
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    authors = load_author_stats(cursor)
+    tag_popularity = load_tag_popularity(cursor)
+    
+    cursor.execute("""
+        SELECT id, author_alias, published_at, fetched_at FROM articles
+        WHERE posted = 0 AND is_spam = 0
+    """)
+    updates: List[tuple] = []
+    for row in cursor.fetchall():
+        author = authors.get(row['author_alias'], {"posted": 0, "spam": 0, "total": 0})
+        signals = compute_signals(
+            dict(row),
+            author_posts=author["posted"],
+            author_spam_ratio=author["spam"] / author["total"] if author["total"] else 0.0,
+            tag_popularity=tag_popularity.get(row['id'], 0.0),
+            half_life_hours=half_life,
+            now=now
+        )
+        updates.append((score(signals, weights), row['id']))
+    
+    cursor.executemany("UPDATE articles SET priority = ? WHERE id = ?", updates)
+    conn.commit()
+    conn.close()
+    
+    return len(updates)
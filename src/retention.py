@@ -0,0 +1,275 @@
+"""Retention policies: archive aged rows, compact the database and rotate output files."""
+
+import gzip
+import json
+import shutil
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from config import BASE_DIR, MOCK_TWEETS_MAX_BYTES, TWEETS_QUEUE_RETENTION_DAYS
+from src.feeds import get_profile
+
+
+RETENTION_RULES_FILE = BASE_DIR / "config" / "retention.json"
+
+# Used when config/retention.json does not exist
+DEFAULT_POLICIES = [
+    {
+        "id": "posted_descriptions",
+        "table": "articles",
+        "status": "posted",
+        "days": 90,
+        "strip": ["description"],
+        "enabled": True
+    },
+    {
+        # author_alias is kept: the queue priority spam signal counts spam per author
+        "id": "old_spam",
+        "table": "articles",
+        "status": "spam",
+        "days": 30,
+        "strip": ["title", "author_name", "description", "url", "tags"],
+        "enabled": True
+    }
+]
+
+# What policies may touch. content_id is never stripped so duplicate
+# detection keeps working for archived rows.
+TABLES = {
+    "articles": {
+        "age_field": "fetched_at",
+        # Only articles that can never be tweeted again: stripping a pending
+        # article would leave an empty row in the queue
+        "statuses": {
+            "posted": "posted = 1",
+            "spam": "is_spam = 1",
+        },
+        # column -> value once stripped (NOT NULL columns become empty strings)
+        "strippable": {
+            "title": "",
+            "url": "",
+            "author_name": None,
+            "author_alias": None,
+            "description": None,
+            "tags": None,
+        },
+    },
+    "tweet_log": {
+        "age_field": "tweeted_at",
+        "statuses": {"any": "1 = 1"},
+        "strippable": {"title": "", "url": ""},
+    },
+}
+
+BATCH_SIZE = 500
+
+
+def load_policies() -> List[Dict[str, Any]]:
+    """Load retention policies from config file, or defaults if absent."""
+    policies = DEFAULT_POLICIES
+    
+    if RETENTION_RULES_FILE.exists():
+        with open(RETENTION_RULES_FILE) as f:
+            data = json.load(f)
+            policies = data.get("policies", [])
+    
+    return [p for p in policies if p.get("enabled", True)]
+
+
+def validate_policy(policy: Dict[str, Any]):
+    """Raise ValueError if policy refers to unknown tables, statuses or columns."""
+    policy_id = policy.get("id", "unknown")
+    table = TABLES.get(policy.get("table"))
+    if table is None:
+        raise ValueError(f"Retention policy {policy_id}: unknown table {policy.get('table')}")
+    
+    status = policy.get("status", "any")
+    if status not in table["statuses"]:
+        allowed = ", ".join(table["statuses"])
+        raise ValueError(f"Retention policy {policy_id}: status {status} not allowed for "
+                         f"{policy['table']} (use one of: {allowed})")
+    
+    for column in policy.get("strip", []):
+        if column not in table["strippable"]:
+            raise ValueError(f"Retention policy {policy_id}: column {column} cannot be stripped")
+    
+    if int(policy.get("days", 0)) < 1:
+        raise ValueError(f"Retention policy {policy_id}: days must be at least 1")
+
+
+def _append_jsonl_gz(path, rows: List[Dict[str, Any]]):
+    """Append rows to a gzip-compressed JSONL file (one gzip member per call)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def _export_partitioned(archive_dir: Path, name: str, rows: List[Dict[str, Any]], ts_field: str) -> int:
+    """Export rows to <archive_dir>/<name>/<YYYY-MM-DD>.jsonl.gz by row date."""
+    partitions: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        day = datetime.fromtimestamp(row.get(ts_field) or 0).strftime("%Y-%m-%d")
+        partitions.setdefault(day, []).append(row)
+    
+    for day, day_rows in partitions.items():
+        _append_jsonl_gz(archive_dir / name / f"{day}.jsonl.gz", day_rows)
+    
+    return len(rows)
+
+
+def apply_policy(conn: sqlite3.Connection, policy: Dict[str, Any], archive_dir: Path,
+                 dry_run: bool = False) -> int:
+    """Archive and strip rows matching policy. Returns number of rows affected."""
+    validate_policy(policy)
+    
+    table_name = policy["table"]
+    table = TABLES[table_name]
+    age_field = table["age_field"]
+    columns = policy.get("strip", [])
+    if not columns:
+        return 0
+    
+    cutoff_ts = int((datetime.now() - timedelta(days=int(policy["days"]))).timestamp())
+    
+    # Rows already stripped no longer match, so re-running is a no-op
+    not_stripped = " OR ".join(
+        f"{c} IS NOT NULL" if table["strippable"][c] is None else f"{c} != ''"
+        for c in columns
+    )
+    where = f"{table['statuses'][policy.get('status', 'any')]} AND {age_field} < ? AND ({not_stripped})"
+    
+    cursor = conn.cursor()
+    
+    if dry_run:
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {where}", (cutoff_ts,))
+        return cursor.fetchone()[0]
+    
+    assignments = ", ".join(f"{c} = ?" for c in columns)
+    values = [table["strippable"][c] for c in columns]
+    
+    affected = 0
+    while True:
+        cursor.execute(f"SELECT * FROM {table_name} WHERE {where} LIMIT ?", (cutoff_ts, BATCH_SIZE))
+        rows = [dict(row) for row in cursor.fetchall()]
+        if not rows:
+            break
+    
+        # Archive first: a crash before commit re-exports, never loses data
+        _export_partitioned(archive_dir, table_name, rows, age_field)
+    
+        ids = [row["id"] for row in rows]
+        cursor.executemany(
+            f"UPDATE {table_name} SET {assignments} WHERE id = ?",
+            [(*values, row_id) for row_id in ids]
+        )
+        if table_name == "articles" and "tags" in columns:
+            # Keep running tag counts equal to what rebuild_tag_index would produce
+            cursor.executemany("""
+                UPDATE tags SET article_count = article_count - 1
+                WHERE id IN (SELECT tag_id FROM article_tags WHERE article_id = ?)
+            """, [(row["id"],) for row in rows if not row["is_spam"]])
+            cursor.executemany("DELETE FROM article_tags WHERE article_id = ?", [(i,) for i in ids])
+    
+        conn.commit()
+        affected += len(rows)
+    
+    return affected
+
+
+def compact_db(conn: sqlite3.Connection) -> int:
+    """Return free pages to the filesystem. Returns pages reclaimed."""
+    cursor = conn.cursor()
+    
+    cursor.execute("PRAGMA page_count")
+    pages_before = cursor.fetchone()[0]
+    
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] != 2:
+        # One-off conversion of databases created before incremental mode
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+    else:
+        cursor.execute("PRAGMA incremental_vacuum")
+        cursor.fetchall()
+    
+    cursor.execute("PRAGMA page_count")
+    return pages_before - cursor.fetchone()[0]
+
+
+def rotate_mock_tweets(mock_file: Path, archive_dir: Path, dry_run: bool = False) -> bool:
+    """Compress mock_tweets.txt into the archive once it exceeds the size limit."""
+    if not mock_file.exists() or mock_file.stat().st_size < MOCK_TWEETS_MAX_BYTES:
+        return False
+    
+    if dry_run:
+        return True
+    
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    target = archive_dir / "mock_tweets" / f"mock_tweets-{stamp}.txt.gz"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(mock_file, "rb") as src, gzip.open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    mock_file.write_text("")
+    
+    return True
+
+
+def compact_tweets_queue(queue_file: Path, archive_dir: Path, dry_run: bool = False) -> int:
+    """Move aged entries out of tweets_queue.json. Returns entries archived."""
+    if not queue_file.exists():
+        return 0
+    
+    with open(queue_file) as f:
+        try:
+            queue = json.load(f)
+        except json.JSONDecodeError:
+            return 0
+    
+    cutoff_ts = int((datetime.now() - timedelta(days=TWEETS_QUEUE_RETENTION_DAYS)).timestamp())
+    aged = [t for t in queue if t.get("posted_at", 0) < cutoff_ts]
+    
+    if not aged or dry_run:
+        return len(aged)
+    
+    _export_partitioned(archive_dir, "tweets_queue", aged, "posted_at")
+    
+    keep = [t for t in queue if t.get("posted_at", 0) >= cutoff_ts]
+    tmp_file = queue_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(keep, f, indent=2)
+    tmp_file.replace(queue_file)
+    
+    return len(aged)
+
+
+def run_retention(profile: Optional[dict] = None, dry_run: bool = False) -> dict:
+    """Apply all retention policies to a feed, compact its database and rotate outputs.
+    
+    Returns stats with rows affected per policy.
+    """
+    profile = profile or get_profile()
+    archive_dir = profile['archive_dir']
+    policies = load_policies()
+    for policy in policies:
+        validate_policy(policy)
+    
+    conn = sqlite3.connect(profile['db_path'])
+    conn.row_factory = sqlite3.Row
+    
+    result = {"policies": {}, "pages_reclaimed": 0}
+    for policy in policies:
+        result["policies"][policy["id"]] = apply_policy(conn, policy, archive_dir, dry_run=dry_run)
+    
+    if not dry_run:
+        result["pages_reclaimed"] = compact_db(conn)
+    
+    conn.close()
+    
+    result["mock_tweets_rotated"] = rotate_mock_tweets(profile['mock_file'], archive_dir, dry_run=dry_run)
+    result["queue_entries_archived"] = compact_tweets_queue(profile['queue_file'], archive_dir, dry_run=dry_run)
+    
+    return result
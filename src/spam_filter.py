@@ -3,7 +3,7 @@
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 
 from config import BASE_DIR
 
@@ -12,10 +12,11 @@ SPAM_RULES_FILE = BASE_DIR / "config" / "spam_rules.json"
 SPAM_RULES_LOCAL_FILE = BASE_DIR / "config" / "spam_rules.local.json"
 
 
-def load_rules() -> List[Dict[str, Any]]:
+def load_rules(extra_files: Optional[List[Path]] = None) -> List[Dict[str, Any]]:
     """Load spam detection rules from config files.
     
-    Loads main rules and optionally extends with local rules.
+    Loads main rules and optionally extends with local rules and any
+    feed-specific rule files.
     """
     rules = []
     
@@ -31,6 +32,13 @@ def load_rules() -> List[Dict[str, Any]]:
             data = json.load(f)
             rules.extend(data.get("rules", []))
     
+    # Feed-specific rules (see src/feeds.py)
+    for rules_file in extra_files or []:
+        if rules_file.exists():
+            with open(rules_file) as f:
+                data = json.load(f)
+                rules.extend(data.get("rules", []))
+    
     return [r for r in rules if r.get("enabled", True)]
 
 
@@ -74,16 +82,19 @@ def check_author_rule(article: Dict[str, Any], rule: Dict[str, Any]) -> bool:
     return author in patterns
 
 
-def check_spam(article: Dict[str, Any]) -> Tuple[bool, List[str]]:
+def check_spam(article: Dict[str, Any],
+               rules: Optional[List[Dict[str, Any]]] = None) -> Tuple[bool, List[str]]:
     """Check if article is spam.
     
     Args:
         article: Article dict with title, author_alias, tags, etc.
+        rules: Preloaded rules (loaded from config files if None)
     
     Returns:
         Tuple of (is_spam, matched_rule_ids)
     """
-    rules = load_rules()
+    if rules is None:
+        rules = load_rules()
     matched_rules = []
     
     for rule in rules:
@@ -3,22 +3,28 @@ from pathlib import Path
 from typing import Optional
 import json
 import httpx
-from config import MOCK_TWEETS_FILE, TWEETS_QUEUE_FILE, MAKECOM_WEBHOOK_URL, MAKECOM_API_KEY
-from src.database import get_next_article, mark_posted
+from src.database import init_db, get_next_article, mark_posted, get_article_hashtags, tag_to_hashtag
+from src.feeds import get_profile
+from src.priority import rescore_pending
 
 
-def format_tweet(article: dict) -> str:
+def format_tweet(article: dict, profile: Optional[dict] = None) -> str:
     """Format article as tweet (max 280 chars)."""
+    profile = profile or get_profile()
+    limit = profile['hashtag_limit']
     title = article['title']
     url = article['url']
     tags = article.get('tags', '')
     
-    # Convert tags to hashtags (limit to first 3)
-    hashtags = ""
-    if tags:
-        tag_list = [f"#{tag.strip().replace('-', '').replace(' ', '')}" 
-                    for tag in tags.split(',')[:3]]
-        hashtags = " ".join(tag_list)
+    # Pick hashtags from the normalized tag index, falling back to the raw
+    # tag string for articles that have not been indexed yet
+    tag_list = []
+    if article.get('id'):
+        tag_list = get_article_hashtags(article['id'], limit, profile['hashtag_policy'],
+                                        db_path=profile['db_path'])
+    if not tag_list and tags:
+        tag_list = [tag_to_hashtag(tag) for tag in tags.split(',')[:limit]]
+    hashtags = " ".join(tag_list)
     
     # Format: Title\n\nHashtags\n\nURL
     # Twitter URL takes ~23 chars after shortening
@@ -34,8 +40,9 @@ def format_tweet(article: dict) -> str:
         return f"{title}\n\n{url}"
 
 
-def post_tweet_webhook(tweet_text: str, article: dict) -> str:
+def post_tweet_webhook(tweet_text: str, article: dict, profile: Optional[dict] = None) -> str:
     """Send tweet to Make.com webhook. Returns tweet_id."""
+    profile = profile or get_profile()
     tweet_id = f"tweet_{int(datetime.now().timestamp())}"
     
     payload = {
@@ -45,31 +52,34 @@ def post_tweet_webhook(tweet_text: str, article: dict) -> str:
         "url": article['url'],
         "title": article['title'],
         "posted_at": int(datetime.now().timestamp()),
-        "status": "pending"
+        "status": "pending",
+        "feed": profile['name']
     }
     
     headers = {"Content-Type": "application/json"}
     
     # Add API key if configured
-    if MAKECOM_API_KEY:
-        headers["x-make-apikey"] = MAKECOM_API_KEY
+    if profile['api_key']:
+        headers["x-make-apikey"] = profile['api_key']
     
-    response = httpx.post(MAKECOM_WEBHOOK_URL, json=payload, headers=headers, timeout=30)
+    response = httpx.post(profile['webhook_url'], json=payload, headers=headers, timeout=30)
     response.raise_for_status()
     
     return tweet_id
 
 
-def post_tweet_json(tweet_text: str, article: dict) -> str:
+def post_tweet_json(tweet_text: str, article: dict, profile: Optional[dict] = None) -> str:
     """Write tweet to JSON queue for Make.com. Returns tweet_id."""
-    TWEETS_QUEUE_FILE.parent.mkdir(exist_ok=True)
+    profile = profile or get_profile()
+    queue_file = profile['queue_file']
+    queue_file.parent.mkdir(parents=True, exist_ok=True)
     
     tweet_id = f"tweet_{int(datetime.now().timestamp())}"
     
     # Read existing queue
     queue = []
-    if TWEETS_QUEUE_FILE.exists():
-        with open(TWEETS_QUEUE_FILE, 'r') as f:
+    if queue_file.exists():
+        with open(queue_file, 'r') as f:
             try:
                 queue = json.load(f)
             except json.JSONDecodeError:
@@ -83,25 +93,28 @@ def post_tweet_json(tweet_text: str, article: dict) -> str:
         "url": article['url'],
         "title": article['title'],
         "posted_at": int(datetime.now().timestamp()),
-        "status": "pending"
+        "status": "pending",
+        "feed": profile['name']
     }
     queue.append(tweet_entry)
     
     # Write back to file
-    with open(TWEETS_QUEUE_FILE, 'w') as f:
+    with open(queue_file, 'w') as f:
         json.dump(queue, f, indent=2)
     
     return tweet_id
 
 
-def post_tweet_mock(tweet_text: str, content_id: str) -> str:
+def post_tweet_mock(tweet_text: str, content_id: str, profile: Optional[dict] = None) -> str:
     """Write tweet to mock file. Returns mock tweet_id."""
-    MOCK_TWEETS_FILE.parent.mkdir(exist_ok=True)
+    profile = profile or get_profile()
+    mock_file = profile['mock_file']
+    mock_file.parent.mkdir(parents=True, exist_ok=True)
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     mock_tweet_id = f"mock_{int(datetime.now().timestamp())}"
     
-    with open(MOCK_TWEETS_FILE, "a") as f:
+    with open(mock_file, "a") as f:
         f.write(f"[{timestamp}] Posted (ID: {mock_tweet_id}):\n")
         f.write(f"{tweet_text}\n")
         f.write("---\n\n")
@@ -109,35 +122,44 @@ def post_tweet_mock(tweet_text: str, content_id: str) -> str:
     return mock_tweet_id
 
 
-def post_tweet() -> Optional[dict]:
-    """Get next article and post tweet. Returns result or None if queue empty."""
-    article = get_next_article()
+def post_tweet(profile: Optional[dict] = None) -> Optional[dict]:
+    """Get next article for a feed and post tweet. Returns result or None if queue empty."""
+    profile = profile or get_profile()
+    
+    # Migrate first: when fetching has been failing, no fetch has run
+    # init_db on a database created before the priority queue
+    init_db(profile['db_path'])
+    
+    # Decay scores even when fetching has been failing
+    rescore_pending(profile)
+    article = get_next_article(profile['db_path'])
     
     if not article:
         return None
     
-    tweet_text = format_tweet(article)
+    tweet_text = format_tweet(article, profile)
     
     # Try webhook first, fallback to JSON file, then mock
     mode = "json_queue"
     try:
-        if MAKECOM_WEBHOOK_URL:
-            tweet_id = post_tweet_webhook(tweet_text, article)
+        if profile['webhook_url']:
+            tweet_id = post_tweet_webhook(tweet_text, article, profile)
             mode = "webhook"
         else:
-            tweet_id = post_tweet_json(tweet_text, article)
+            tweet_id = post_tweet_json(tweet_text, article, profile)
             mode = "json_queue"
     except Exception as e:
         print(f"Webhook error: {e}, falling back to JSON file")
-        tweet_id = post_tweet_json(tweet_text, article)
+        tweet_id = post_tweet_json(tweet_text, article, profile)
         mode = "json_fallback"
     
     # Always write to mock file for backup
-    post_tweet_mock(tweet_text, article['content_id'])
+    post_tweet_mock(tweet_text, article['content_id'], profile)
     
-    mark_posted(article['content_id'], tweet_id)
+    mark_posted(article['content_id'], tweet_id, db_path=profile['db_path'])
     
     return {
+        "feed": profile['name'],
         "content_id": article['content_id'],
         "title": article['title'],
         "tweet_id": tweet_id,